@@ -52,6 +52,7 @@
             pytest-asyncio
             pytest-cov
             pytest-rerunfailures
+            responses
           ];
           checkPhase = ''
             pytest tests/ -m unit
@@ -152,6 +153,7 @@
               pytest-cov
               pytest-rerunfailures
               pytest-xdist
+              responses
               ruff
               mypy
               types-requests
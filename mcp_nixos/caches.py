@@ -1,12 +1,18 @@
 """Cache classes for MCP-NixOS server."""
 
 import json
+import os
 import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import requests
 
 from .config import (
+    CHANNEL_CACHE_TTL,
     FALLBACK_CHANNELS,
     NIXDEV_SEARCH_INDEX,
     NIXOS_API,
@@ -17,45 +23,108 @@ from .config import (
 )
 
 
+def _channel_cache_file() -> Path:
+    """Location of the persisted channel cache (honours XDG_CACHE_HOME)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "mcp-nixos" / "channels.json"
+
+
+def _is_str_mapping(value: Any) -> bool:
+    """True for a dict mapping strings to strings, the only shape the channel cache ever writes."""
+    return isinstance(value, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in value.items())
+
+
 class ChannelCache:
     """Cache for discovered channels and resolved mappings."""
 
+    __slots__ = ("available_channels", "resolved_channels", "using_fallback", "_disk_checked")
+
     def __init__(self) -> None:
         self.available_channels: dict[str, str] | None = None
         self.resolved_channels: dict[str, str] | None = None
         self.using_fallback: bool = False
+        self._disk_checked: bool = False
 
     def get_available(self) -> dict[str, str]:
+        self._load_once()
         if self.available_channels is None:
             self.available_channels = self._discover_available_channels()
         return self.available_channels if self.available_channels is not None else {}
 
     def get_resolved(self) -> dict[str, str]:
+        self._load_once()
         if self.resolved_channels is None:
             self.resolved_channels = self._resolve_channels()
+            if not self.using_fallback:
+                self._save_to_disk()
         return self.resolved_channels if self.resolved_channels is not None else {}
 
+    def _load_once(self) -> None:
+        """Read the persisted channels on first use, not at import, so XDG_CACHE_HOME is honoured late."""
+        if self._disk_checked:
+            return
+        self._disk_checked = True
+        if self.available_channels is None and self.resolved_channels is None:
+            self._load_from_disk()
+
+    def _load_from_disk(self) -> None:
+        """Restore channels discovered by a previous process if they are still fresh."""
+        path = _channel_cache_file()
+        try:
+            if time.time() - path.stat().st_mtime > CHANNEL_CACHE_TTL:
+                return
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        available = data.get("available")
+        resolved = data.get("resolved")
+        # Resolved index names end up in Elasticsearch URLs; treat anything but str -> str as corrupt
+        if _is_str_mapping(available) and _is_str_mapping(resolved) and resolved:
+            self.available_channels = available
+            self.resolved_channels = resolved
+
+    def _save_to_disk(self) -> None:
+        """Persist discovered channels atomically; failures only cost a warm start."""
+        path = _channel_cache_file()
+        payload = {"available": self.available_channels or {}, "resolved": self.resolved_channels or {}}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".channels-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(payload, f)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError:
+            pass  # Read-only or missing home directory; keep the in-memory cache only
+
     def _discover_available_channels(self) -> dict[str, str]:
         generations = [43, 44, 45, 46]
         versions = ["unstable", "25.05", "25.11", "26.05", "26.11"]
-        available = {}
-        for gen in generations:
-            for version in versions:
-                pattern = f"latest-{gen}-nixos-{version}"
-                try:
-                    resp = requests.post(
-                        f"{NIXOS_API}/{pattern}/_count",
-                        json={"query": {"match_all": {}}},
-                        auth=NIXOS_AUTH,
-                        timeout=10,
-                    )
-                    if resp.status_code == 200:
-                        count = resp.json().get("count", 0)
-                        if count > 0:
-                            available[pattern] = f"{count:,} documents"
-                except Exception:
-                    continue
-        return available
+        patterns = [f"latest-{gen}-nixos-{version}" for gen in generations for version in versions]
+        # Probe every candidate index concurrently; map() preserves the pattern order
+        with ThreadPoolExecutor(max_workers=len(patterns)) as executor:
+            counts = list(executor.map(self._count_documents, patterns))
+        return {pattern: f"{count:,} documents" for pattern, count in zip(patterns, counts, strict=True) if count > 0}
+
+    @staticmethod
+    def _count_documents(pattern: str) -> int:
+        try:
+            resp = requests.post(
+                f"{NIXOS_API}/{pattern}/_count",
+                json={"query": {"match_all": {}}},
+                auth=NIXOS_AUTH,
+                timeout=10,
+            )
+            if resp.status_code == 200:
+                return int(resp.json().get("count", 0))
+        except Exception:
+            pass  # Treat unreachable or malformed indices as empty
+        return 0
 
     def _resolve_channels(self) -> dict[str, str]:
         available = self.get_available()
@@ -31,6 +31,9 @@ FALLBACK_CHANNELS = {
     "beta": "latest-44-nixos-25.11",
 }
 
+# Resolved channels are persisted under $XDG_CACHE_HOME/mcp-nixos for warm starts
+CHANNEL_CACHE_TTL = 24 * 60 * 60
+
 HOME_MANAGER_URL = "https://nix-community.github.io/home-manager/options.xhtml"
 DARWIN_URL = "https://nix-darwin.github.io/nix-darwin/manual/index.html"
 FLAKE_INDEX = "latest-44-group-manual"
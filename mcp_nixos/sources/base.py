@@ -1,5 +1,6 @@
 """Base functionality shared across data sources."""
 
+import re
 from typing import Any
 
 import requests
@@ -18,12 +19,17 @@ from ..utils import error, parse_html_options
 # Channel helpers
 # =============================================================================
 
+_CHANNEL_NAME_RE = re.compile(r"[a-z0-9._-]+")
+
 
 def get_channels() -> dict[str, str]:
     return channel_cache.get_resolved()
 
 
 def validate_channel(channel: str) -> bool:
+    # Reject malformed names before they can trigger channel discovery
+    if not _CHANNEL_NAME_RE.fullmatch(channel):
+        return False
     channels = get_channels()
     if channel in channels:
         index = channels[channel]
@@ -23,8 +23,7 @@ def strip_html(html: str | None) -> str:
 
 
 def error(msg: str, code: str = "ERROR") -> str:
-    msg = str(msg) if msg is not None else ""
-    return f"Error ({code}): {msg}"
+    return f"Error ({code}): {'' if msg is None else msg}"
 
 
 def parse_html_options(url: str, query: str = "", prefix: str = "", limit: int = 100) -> list[dict[str, str]]:
@@ -34,10 +33,13 @@ def parse_html_options(url: str, query: str = "", prefix: str = "", limit: int =
         soup = BeautifulSoup(resp.content, "html.parser")
         options = []
         dts = soup.find_all("dt")
+        is_home_manager = "home-manager" in url
+        # Fold the query once instead of lowering it again for every <dt>
+        query_folded = query.casefold()
 
         for dt in dts:
             name = ""
-            if "home-manager" in url:
+            if is_home_manager:
                 anchor = dt.find("a", id=True)
                 if anchor:
                     anchor_id = anchor.get("id", "")
@@ -55,7 +57,7 @@ def parse_html_options(url: str, query: str = "", prefix: str = "", limit: int =
 
             if "." not in name and len(name.split()) > 1:
                 continue
-            if query and query.lower() not in name.lower():
+            if query_folded and query_folded not in name.casefold():
                 continue
             if prefix and not (name.startswith(prefix + ".") or name == prefix):
                 continue
@@ -1,5 +1,45 @@
 """Minimal test configuration for refactored MCP-NixOS."""
 
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Imported before isolated_cache_home runs; that is only safe because ChannelCache reads its disk cache lazily
+from mcp_nixos import server
+
+# Source delegates the ``nix`` tool dispatches to; stubbed wholesale by ``patched_server``.
+SERVER_DELEGATES = (
+    "_search_nixos",
+    "_search_home_manager",
+    "_search_darwin",
+    "_search_flakes",
+    "_search_flakehub",
+    "_search_nixvim",
+    "_info_nixos",
+    "_info_home_manager",
+    "_info_darwin",
+    "_info_flakehub",
+    "_info_nixvim",
+    "_stats_nixos",
+    "_stats_home_manager",
+    "_stats_darwin",
+    "_stats_flakes",
+    "_stats_flakehub",
+    "_stats_nixvim",
+    "_browse_options",
+    "_browse_nixvim_options",
+    "_list_channels",
+    "_search_wiki",
+    "_info_wiki",
+    "_search_nixdev",
+    "_search_noogle",
+    "_info_noogle",
+    "_stats_noogle",
+    "_browse_noogle_options",
+)
+# Delegates the tool awaits directly rather than running in a worker thread.
+ASYNC_SERVER_DELEGATES = ("_search_nixhub", "_info_nixhub", "_check_binary_cache")
+
 
 def pytest_addoption(parser):
     """Add test filtering options."""
@@ -18,3 +58,33 @@ def pytest_configure(config):
         config.option.markexpr = "not integration"
     elif config.getoption("--integration"):
         config.option.markexpr = "integration"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_home(tmp_path_factory):
+    """Keep the persisted channel cache out of the user's real cache directory."""
+    assert not server.channel_cache._disk_checked, "channel cache was read before XDG_CACHE_HOME was isolated"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("xdg-cache")))
+        yield
+
+
+@pytest.fixture(scope="class")
+def _server_stubs():
+    """Swap the server delegates for Mocks once per class via plain attribute assignment."""
+    originals = {name: getattr(server, name) for name in SERVER_DELEGATES + ASYNC_SERVER_DELEGATES}
+    for name in SERVER_DELEGATES:
+        setattr(server, name, Mock(name=name))
+    for name in ASYNC_SERVER_DELEGATES:
+        setattr(server, name, AsyncMock(name=name))
+    yield server
+    for name, original in originals.items():
+        setattr(server, name, original)
+
+
+@pytest.fixture
+def patched_server(_server_stubs):
+    """Server module with stubbed delegates, reset so each test starts from a clean Mock."""
+    for name in SERVER_DELEGATES + ASYNC_SERVER_DELEGATES:
+        getattr(_server_stubs, name).reset_mock(return_value=True, side_effect=True)
+    return _server_stubs
@@ -179,7 +179,6 @@ class TestIsBinaryFile:
 class TestRunNixCommand:
     """Test _run_nix_command helper."""
 
-    @pytest.mark.asyncio
     async def test_successful_command(self):
         with patch("mcp_nixos.server.asyncio.create_subprocess_exec") as mock_exec:
             mock_process = AsyncMock()
@@ -192,7 +191,6 @@ class TestRunNixCommand:
             assert stdout == "output"
             assert stderr == ""
 
-    @pytest.mark.asyncio
     async def test_failed_command(self):
         with patch("mcp_nixos.server.asyncio.create_subprocess_exec") as mock_exec:
             mock_process = AsyncMock()
@@ -204,7 +202,6 @@ class TestRunNixCommand:
             assert success is False
             assert stderr == "error message"
 
-    @pytest.mark.asyncio
     async def test_timeout(self):
         with patch("mcp_nixos.server.asyncio.create_subprocess_exec") as mock_exec:
             mock_process = AsyncMock()
@@ -217,7 +214,6 @@ class TestRunNixCommand:
             assert success is False
             assert "timed out" in stderr.lower()
 
-    @pytest.mark.asyncio
     async def test_nix_not_found(self):
         with patch("mcp_nixos.server.asyncio.create_subprocess_exec") as mock_exec:
             mock_exec.side_effect = FileNotFoundError()
@@ -231,14 +227,12 @@ class TestRunNixCommand:
 class TestGetFlakeInputs:
     """Test _get_flake_inputs helper."""
 
-    @pytest.mark.asyncio
     async def test_not_a_flake_directory(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             success, data, err_msg = await _get_flake_inputs(tmpdir)
             assert success is False
             assert "no flake.nix found" in err_msg.lower()
 
-    @pytest.mark.asyncio
     async def test_successful_flake_archive(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             # Create a fake flake.nix
@@ -265,20 +259,17 @@ class TestGetFlakeInputs:
 class TestFlakeInputsList:
     """Test _flake_inputs_list function."""
 
-    @pytest.mark.asyncio
     async def test_nix_not_available(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=False):
             result = await _flake_inputs_list(".")
             assert "NIX_NOT_FOUND" in result
 
-    @pytest.mark.asyncio
     async def test_not_a_flake(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             with tempfile.TemporaryDirectory() as tmpdir:
                 result = await _flake_inputs_list(tmpdir)
                 assert "FLAKE_ERROR" in result
 
-    @pytest.mark.asyncio
     async def test_successful_list(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             mock_data = {
@@ -300,13 +291,11 @@ class TestFlakeInputsList:
 class TestFlakeInputsLs:
     """Test _flake_inputs_ls function."""
 
-    @pytest.mark.asyncio
     async def test_nix_not_available(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=False):
             result = await _flake_inputs_ls(".", "nixpkgs")
             assert "NIX_NOT_FOUND" in result
 
-    @pytest.mark.asyncio
     async def test_input_not_found(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             mock_data = {
@@ -323,20 +312,17 @@ class TestFlakeInputsLs:
 class TestFlakeInputsRead:
     """Test _flake_inputs_read function."""
 
-    @pytest.mark.asyncio
     async def test_nix_not_available(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=False):
             result = await _flake_inputs_read(".", "nixpkgs:flake.nix", 500)
             assert "NIX_NOT_FOUND" in result
 
-    @pytest.mark.asyncio
     async def test_invalid_format_no_colon(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             result = await _flake_inputs_read(".", "nixpkgs", 500)
             assert "INVALID_FORMAT" in result
             assert "input:path" in result.lower()
 
-    @pytest.mark.asyncio
     async def test_invalid_format_empty_path(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             result = await _flake_inputs_read(".", "nixpkgs:", 500)
@@ -347,13 +333,11 @@ class TestFlakeInputsRead:
 class TestNixToolFlakeInputsRouting:
     """Test nix tool routing for flake-inputs action."""
 
-    @pytest.mark.asyncio
     async def test_invalid_type(self):
         result = await nix_fn(action="flake-inputs", type="invalid")
         assert "Error" in result
         assert "list|ls|read" in result
 
-    @pytest.mark.asyncio
     async def test_ls_requires_query(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             with patch("mcp_nixos.server._get_flake_inputs", return_value=(True, {"inputs": {}}, "")):
@@ -361,20 +345,17 @@ class TestNixToolFlakeInputsRouting:
                 assert "Error" in result
                 assert "Query required" in result
 
-    @pytest.mark.asyncio
     async def test_read_requires_query(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             result = await nix_fn(action="flake-inputs", type="read")
             assert "Error" in result
             assert "Query required" in result
 
-    @pytest.mark.asyncio
     async def test_read_limit_validation(self):
         result = await nix_fn(action="flake-inputs", type="read", query="nixpkgs:file.nix", limit=3000)
         assert "Error" in result
         assert "INVALID_LIMIT" in result or "Limit" in result
 
-    @pytest.mark.asyncio
     async def test_list_default_type(self):
         """Test that default type (packages) routes to list for flake-inputs."""
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
@@ -383,7 +364,6 @@ class TestNixToolFlakeInputsRouting:
                 result = await nix_fn(action="flake-inputs")
                 assert "No inputs found" in result or "Flake inputs" in result
 
-    @pytest.mark.asyncio
     async def test_source_as_flake_dir(self):
         """Test that non-known source is treated as flake directory."""
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
@@ -397,7 +377,6 @@ class TestNixToolFlakeInputsRouting:
 class TestPlainTextOutput:
     """Verify flake-inputs outputs are plain text."""
 
-    @pytest.mark.asyncio
     async def test_list_no_xml(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=True):
             mock_data = {
@@ -409,7 +388,6 @@ class TestPlainTextOutput:
                 assert not result.strip().startswith("<")
                 assert "</result>" not in result
 
-    @pytest.mark.asyncio
     async def test_error_no_xml(self):
         with patch("mcp_nixos.server._check_nix_available", return_value=False):
             result = await _flake_inputs_list(".")
@@ -421,7 +399,6 @@ class TestPlainTextOutput:
 class TestBugFixes:
     """Tests for bug fixes identified in peer review."""
 
-    @pytest.mark.asyncio
     async def test_flake_inputs_read_limit_above_100(self):
         """Bug #1: flake-inputs read should accept limits > 100 (up to 2000)."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -446,7 +423,6 @@ class TestBugFixes:
                     # Should NOT be rejected with limit error
                     assert "Limit must be 1-100" not in result
 
-    @pytest.mark.asyncio
     async def test_flake_inputs_read_default_limit_is_500(self):
         """Bug #2: flake-inputs read with default limit should use 500, not 20."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -478,7 +454,6 @@ class TestBugFixes:
                         actual_limit = call_args[0][2]
                         assert actual_limit == 500, f"Expected limit 500, got {actual_limit}"
 
-    @pytest.mark.asyncio
     async def test_subprocess_killed_on_timeout(self):
         """Bug #3: subprocess should be killed when timeout occurs."""
         # We test this by verifying the timeout handling cleans up the process
@@ -27,42 +27,35 @@ def assert_plain_text(result: str) -> None:
 class TestNixSearchIntegration:
     """Test nix search action against real APIs."""
 
-    @pytest.mark.asyncio
     async def test_search_nixos_packages(self):
         result = await nix_fn(action="search", query="firefox", source="nixos", type="packages", limit=3)
         assert "Found" in result or "firefox" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_nixos_options(self):
         result = await nix_fn(action="search", query="nginx", source="nixos", type="options", limit=3)
         assert "nginx" in result.lower() or "No options found" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_home_manager(self):
         result = await nix_fn(action="search", query="git", source="home-manager", limit=3)
         assert "git" in result.lower() or "No Home Manager" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_darwin(self):
         result = await nix_fn(action="search", query="dock", source="darwin", limit=3)
         assert "dock" in result.lower() or "No nix-darwin" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_flakes(self):
         result = await nix_fn(action="search", query="neovim", source="flakes", limit=3)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_nixvim(self):
         result = await nix_fn(action="search", query="telescope", source="nixvim", limit=3)
         assert "telescope" in result.lower() or "No Nixvim" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_flakehub(self):
         result = await nix_fn(action="search", query="nixpkgs", source="flakehub", limit=3)
         assert "flakehub" in result.lower() or "nixpkgs" in result.lower() or "No flakes" in result
@@ -74,7 +67,6 @@ class TestNixSearchIntegration:
 class TestNixInfoIntegration:
     """Test nix info action against real APIs."""
 
-    @pytest.mark.asyncio
     async def test_info_nixos_package(self):
         result = await nix_fn(action="info", query="firefox", source="nixos", type="package")
         assert "Package: firefox" in result or "NOT_FOUND" in result
@@ -83,31 +75,26 @@ class TestNixInfoIntegration:
             assert "Description:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_nixos_option(self):
         result = await nix_fn(action="info", query="services.nginx.enable", source="nixos", type="option")
         assert "Option:" in result or "NOT_FOUND" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_home_manager(self):
         result = await nix_fn(action="info", query="programs.git.enable", source="home-manager")
         assert "Option: programs.git.enable" in result or "not found" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_darwin(self):
         result = await nix_fn(action="info", query="system.defaults.dock.autohide", source="darwin")
         assert "Option:" in result or "not found" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_nixvim(self):
         result = await nix_fn(action="info", query="plugins.telescope.enable", source="nixvim")
         assert "Nixvim Option:" in result or "not found" in result or "NOT_FOUND" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_flakehub(self):
         result = await nix_fn(action="info", query="NixOS/nixpkgs", source="flakehub")
         assert "FlakeHub Flake:" in result or "NOT_FOUND" in result
@@ -121,7 +108,6 @@ class TestNixInfoIntegration:
 class TestNixStatsIntegration:
     """Test nix stats action against real APIs."""
 
-    @pytest.mark.asyncio
     async def test_stats_nixos(self):
         result = await nix_fn(action="stats", source="nixos")
         assert "NixOS Statistics" in result
@@ -129,31 +115,26 @@ class TestNixStatsIntegration:
         assert "Options:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_stats_home_manager(self):
         result = await nix_fn(action="stats", source="home-manager")
         assert "Home Manager Statistics" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_stats_darwin(self):
         result = await nix_fn(action="stats", source="darwin")
         assert "nix-darwin Statistics" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_stats_flakes(self):
         result = await nix_fn(action="stats", source="flakes")
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_stats_nixvim(self):
         result = await nix_fn(action="stats", source="nixvim")
         assert "Nixvim Statistics" in result
         assert "Total options:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_stats_flakehub(self):
         result = await nix_fn(action="stats", source="flakehub")
         assert "FlakeHub Statistics" in result
@@ -166,30 +147,25 @@ class TestNixStatsIntegration:
 class TestNixOptionsIntegration:
     """Test nix options action against real APIs."""
 
-    @pytest.mark.asyncio
     async def test_browse_home_manager(self):
         result = await nix_fn(action="options", source="home-manager")
         assert "Home Manager" in result or "categories" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_browse_darwin(self):
         result = await nix_fn(action="options", source="darwin")
         assert "nix-darwin" in result or "categories" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_browse_with_prefix(self):
         result = await nix_fn(action="options", source="home-manager", query="programs")
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_browse_nixvim(self):
         result = await nix_fn(action="options", source="nixvim")
         assert "Nixvim option categories" in result or "categories" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_browse_nixvim_with_prefix(self):
         result = await nix_fn(action="options", source="nixvim", query="plugins")
         assert "plugins" in result.lower()
@@ -201,7 +177,6 @@ class TestNixOptionsIntegration:
 class TestNixChannelsIntegration:
     """Test nix channels action."""
 
-    @pytest.mark.asyncio
     async def test_list_channels(self):
         result = await nix_fn(action="channels")
         assert "unstable" in result.lower()
@@ -213,7 +188,6 @@ class TestNixChannelsIntegration:
 class TestNixVersionsIntegration:
     """Test nix_versions against real NixHub API."""
 
-    @pytest.mark.asyncio
     async def test_package_versions(self):
         result = await nix_versions_fn(package="python", limit=3)
         assert "Package: python" in result or "Error" in result
@@ -221,12 +195,10 @@ class TestNixVersionsIntegration:
             assert "version" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_find_specific_version(self):
         result = await nix_versions_fn(package="nodejs", version="20.0.0", limit=5)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_nonexistent_package(self):
         result = await nix_versions_fn(package="nonexistent-package-xyz-123")
         assert "Error" in result
@@ -238,13 +210,11 @@ class TestNixVersionsIntegration:
 class TestPlainTextOutput:
     """Verify all integration outputs are plain text."""
 
-    @pytest.mark.asyncio
     @pytest.mark.flaky(reruns=3, reruns_delay=2)
     async def test_no_xml_in_search(self):
         result = await nix_fn(action="search", query="git", source="nixos", limit=1)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     @pytest.mark.flaky(reruns=3, reruns_delay=2)
     async def test_no_json_in_stats(self):
         result = await nix_fn(action="stats", source="nixos")
@@ -256,7 +226,6 @@ class TestPlainTextOutput:
 class TestWikiIntegration:
     """Integration tests for wiki.nixos.org (hits real API)."""
 
-    @pytest.mark.asyncio
     async def test_search_wiki(self):
         """Test real wiki search."""
         result = await nix_fn(action="search", query="installation", source="wiki", limit=5)
@@ -266,14 +235,12 @@ class TestWikiIntegration:
             assert "wiki" in result.lower() or "Found" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_wiki_flakes(self):
         """Test wiki search for flakes."""
         result = await nix_fn(action="search", query="flakes", source="wiki", limit=5)
         assert isinstance(result, str)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_wiki(self):
         """Test real wiki page info."""
         result = await nix_fn(action="info", query="Flakes", source="wiki")
@@ -283,7 +250,6 @@ class TestWikiIntegration:
             assert "wiki.nixos.org" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_wiki_nvidia(self):
         """Test wiki page info for Nvidia."""
         result = await nix_fn(action="info", query="Nvidia", source="wiki")
@@ -296,7 +262,6 @@ class TestWikiIntegration:
 class TestNixDevIntegration:
     """Integration tests for nix.dev (hits real API)."""
 
-    @pytest.mark.asyncio
     async def test_search_nixdev(self):
         """Test real nix.dev search."""
         from mcp_nixos.server import nixdev_cache
@@ -309,7 +274,6 @@ class TestNixDevIntegration:
             assert "nix.dev" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_nixdev_tutorials(self):
         """Test nix.dev search for tutorials."""
         from mcp_nixos.server import nixdev_cache
@@ -320,7 +284,6 @@ class TestNixDevIntegration:
         assert isinstance(result, str)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_nixdev_packaging(self):
         """Test nix.dev search for packaging."""
         result = await nix_fn(action="search", query="packaging", source="nix-dev", limit=5)
@@ -353,7 +316,6 @@ class TestFlakeInputsIntegration:
         # This test file is in tests/, so repo root is one level up
         return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    @pytest.mark.asyncio
     async def test_list_inputs(self, repo_root):
         """Test listing flake inputs from this repo."""
         result = await nix_fn(action="flake-inputs", type="list", source=repo_root)
@@ -361,7 +323,6 @@ class TestFlakeInputsIntegration:
         assert "Flake inputs" in result or "No inputs found" in result or "FLAKE_ERROR" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_ls_input_root(self, repo_root):
         """Test listing root of a flake input."""
         # First list inputs to get an input name
@@ -382,7 +343,6 @@ class TestFlakeInputsIntegration:
         assert "Contents of" in result or "Error" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_read_flake_nix(self, repo_root):
         """Test reading flake.nix from an input."""
         # First list inputs to get an input name
@@ -404,7 +364,6 @@ class TestFlakeInputsIntegration:
         assert "File:" in result or "NOT_FOUND" in result or "Error" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_invalid_input_name(self, repo_root):
         """Test error handling for non-existent input."""
         result = await nix_fn(action="flake-inputs", type="ls", query="nonexistent-input-xyz", source=repo_root)
@@ -412,7 +371,6 @@ class TestFlakeInputsIntegration:
         assert "NOT_FOUND" in result or "Error" in result or "FLAKE_ERROR" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_graceful_degradation_no_flake(self):
         """Test graceful handling when directory is not a flake."""
         import tempfile
@@ -429,7 +387,6 @@ class TestFlakeInputsIntegration:
 class TestNoogleIntegration:
     """Integration tests for Noogle (hits real noogle.dev API)."""
 
-    @pytest.mark.asyncio
     async def test_search_noogle(self):
         """Test real Noogle search."""
         from mcp_nixos.server import noogle_cache
@@ -443,14 +400,12 @@ class TestNoogleIntegration:
             assert "mapAttrs" in result or "Found" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_noogle_strings(self):
         """Test Noogle search for string functions."""
         result = await nix_fn(action="search", query="concatStrings", source="noogle", limit=5)
         assert isinstance(result, str)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_noogle(self):
         """Test real Noogle function info."""
         result = await nix_fn(action="info", query="lib.attrsets.mapAttrs", source="noogle")
@@ -459,14 +414,12 @@ class TestNoogleIntegration:
             assert "Noogle Function:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_noogle_builtins(self):
         """Test Noogle info for builtins."""
         result = await nix_fn(action="info", query="builtins.map", source="noogle")
         assert isinstance(result, str)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_stats_noogle(self):
         """Test Noogle statistics."""
         result = await nix_fn(action="stats", source="noogle")
@@ -476,7 +429,6 @@ class TestNoogleIntegration:
             assert "Total functions:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_browse_noogle_categories(self):
         """Test browsing Noogle categories."""
         result = await nix_fn(action="options", source="noogle")
@@ -485,7 +437,6 @@ class TestNoogleIntegration:
             assert "categories" in result.lower() or "lib" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_browse_noogle_with_prefix(self):
         """Test browsing Noogle with a prefix."""
         result = await nix_fn(action="options", source="noogle", query="lib.strings")
@@ -500,7 +451,6 @@ class TestNoogleIntegration:
 class TestNixHubIntegration:
     """Integration tests for NixHub (hits real search.devbox.sh API)."""
 
-    @pytest.mark.asyncio
     async def test_search_nixhub(self):
         """Test real NixHub search."""
         result = await nix_fn(action="search", query="python", source="nixhub", limit=5)
@@ -509,14 +459,12 @@ class TestNixHubIntegration:
             assert "Found" in result or "python" in result.lower()
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_search_nixhub_nodejs(self):
         """Test NixHub search for nodejs."""
         result = await nix_fn(action="search", query="nodejs", source="nixhub", limit=5)
         assert isinstance(result, str)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_nixhub(self):
         """Test real NixHub package info."""
         result = await nix_fn(action="info", query="ripgrep", source="nixhub")
@@ -525,7 +473,6 @@ class TestNixHubIntegration:
             assert "Package:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_info_nixhub_with_metadata(self):
         """Test NixHub package info shows metadata."""
         result = await nix_fn(action="info", query="python", source="nixhub")
@@ -542,7 +489,6 @@ class TestNixHubIntegration:
 class TestBinaryCacheIntegration:
     """Integration tests for binary cache status (hits real APIs)."""
 
-    @pytest.mark.asyncio
     async def test_cache_status_hello(self):
         """Test binary cache status for hello package."""
         result = await nix_fn(action="cache", query="hello")
@@ -553,14 +499,12 @@ class TestBinaryCacheIntegration:
             assert "System:" in result or "NOT_FOUND" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_cache_status_with_version(self):
         """Test binary cache status with specific version."""
         result = await nix_fn(action="cache", query="ripgrep", version="latest")
         assert isinstance(result, str)
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_cache_status_with_system(self):
         """Test binary cache status with specific system."""
         result = await nix_fn(action="cache", query="hello", system="x86_64-linux")
@@ -569,7 +513,6 @@ class TestBinaryCacheIntegration:
             assert "x86_64-linux" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_cache_status_nonexistent(self):
         """Test binary cache status for non-existent package."""
         result = await nix_fn(action="cache", query="nonexistent-package-xyz-123")
@@ -583,7 +526,6 @@ class TestBinaryCacheIntegration:
 class TestNixVersionsEnhancedIntegration:
     """Integration tests for enhanced nix_versions output."""
 
-    @pytest.mark.asyncio
     async def test_versions_with_metadata(self):
         """Test nix_versions shows metadata when available."""
         result = await nix_versions_fn(package="ripgrep", limit=3)
@@ -594,7 +536,6 @@ class TestNixVersionsEnhancedIntegration:
             assert "version" in result.lower() or "Total versions:" in result
         assert_plain_text(result)
 
-    @pytest.mark.asyncio
     async def test_versions_platform_info(self):
         """Test nix_versions shows platform info."""
         result = await nix_versions_fn(package="hello", limit=3)
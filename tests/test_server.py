@@ -1,13 +1,21 @@
 """Tests for server helper functions and internal logic."""
 
+import base64
+import json
+import os
+import re
+import time
 from unittest.mock import Mock, patch
 
 import pytest
 import requests
+import responses
+from mcp_nixos.config import CHANNEL_CACHE_TTL
 from mcp_nixos.server import (
     HOME_MANAGER_URL,
     NIXOS_API,
     NIXOS_AUTH,
+    APIError,
     ChannelCache,
     error,
     es_query,
@@ -16,6 +24,17 @@ from mcp_nixos.server import (
     parse_html_options,
     validate_channel,
 )
+from responses import matchers
+
+SEARCH_URL = f"{NIXOS_API}/test-index/_search"
+BASIC_AUTH = "Basic " + base64.b64encode(":".join(NIXOS_AUTH).encode()).decode()
+
+
+@pytest.fixture
+def mocked_responses():
+    """Intercept requests at the transport layer instead of patching requests.post."""
+    with responses.RequestsMock() as rsps:
+        yield rsps
 
 
 @pytest.mark.unit
@@ -43,57 +62,40 @@ class TestErrorFunction:
 class TestElasticsearchQuery:
     """Test Elasticsearch query helper."""
 
-    @patch("mcp_nixos.sources.base.requests.post")
-    def test_success(self, mock_post):
-        mock_resp = Mock()
-        mock_resp.json.return_value = {"hits": {"hits": [{"_source": {"test": "data"}}]}}
-        mock_post.return_value = mock_resp
-
-        result = es_query("test-index", {"match_all": {}})
-        assert len(result) == 1
-        assert result[0]["_source"]["test"] == "data"
-        mock_post.assert_called_once_with(
-            f"{NIXOS_API}/test-index/_search",
-            json={"query": {"match_all": {}}, "size": 20},
-            auth=NIXOS_AUTH,
-            timeout=10,
+    @pytest.mark.parametrize(
+        "payload,size,expected",
+        [
+            ({"hits": {"hits": [{"_source": {"test": "data"}}]}}, None, [{"_source": {"test": "data"}}]),
+            ({"hits": {"hits": []}}, 50, []),
+            ({"invalid": "structure"}, None, []),
+        ],
+        ids=["success", "custom-size", "malformed-response"],
+    )
+    def test_query(self, mocked_responses, payload, size, expected):
+        mocked_responses.add(
+            responses.POST,
+            SEARCH_URL,
+            json=payload,
+            match=[
+                matchers.json_params_matcher({"query": {"match_all": {}}, "size": size or 20}),
+                matchers.header_matcher({"Authorization": BASIC_AUTH}),
+                matchers.request_kwargs_matcher({"timeout": 10}),
+            ],
         )
 
-    @patch("mcp_nixos.sources.base.requests.post")
-    def test_custom_size(self, mock_post):
-        mock_resp = Mock()
-        mock_resp.json.return_value = {"hits": {"hits": []}}
-        mock_post.return_value = mock_resp
-
-        es_query("test-index", {"match_all": {}}, size=50)
-        call_args = mock_post.call_args[1]
-        assert call_args["json"]["size"] == 50
-
-    @patch("mcp_nixos.sources.base.requests.post")
-    def test_timeout(self, mock_post):
-        from mcp_nixos.server import APIError
-
-        mock_post.side_effect = requests.Timeout()
-        with pytest.raises(APIError, match="Connection timed out"):
-            es_query("test-index", {"match_all": {}})
-
-    @patch("mcp_nixos.sources.base.requests.post")
-    def test_request_error(self, mock_post):
-        from mcp_nixos.server import APIError
-
-        mock_post.side_effect = requests.HTTPError("HTTP error")
-        with pytest.raises(APIError, match="API error"):
+        kwargs = {"size": size} if size else {}
+        assert es_query("test-index", {"match_all": {}}, **kwargs) == expected
+
+    @pytest.mark.parametrize(
+        "exc,message",
+        [(requests.Timeout(), "Connection timed out"), (requests.HTTPError("HTTP error"), "API error")],
+        ids=["timeout", "request-error"],
+    )
+    def test_request_failure(self, mocked_responses, exc, message):
+        mocked_responses.add(responses.POST, SEARCH_URL, body=exc)
+        with pytest.raises(APIError, match=message):
             es_query("test-index", {"match_all": {}})
 
-    @patch("mcp_nixos.sources.base.requests.post")
-    def test_malformed_response(self, mock_post):
-        mock_resp = Mock()
-        mock_resp.json.return_value = {"invalid": "structure"}
-        mock_post.return_value = mock_resp
-
-        result = es_query("test-index", {"match_all": {}})
-        assert result == []
-
 
 @pytest.mark.unit
 class TestParseHtmlOptions:
@@ -133,6 +135,24 @@ class TestParseHtmlOptions:
         # Should find the git option
         assert len(result) >= 1
 
+    @patch("mcp_nixos.utils.requests.get")
+    def test_query_is_case_insensitive(self, mock_get):
+        html = b"""
+        <html><body>
+        <dt><a id="opt-programs.git.enable">programs.git.enable</a></dt>
+        <dd><p>Enable git</p><span class="term">Type: boolean</span></dd>
+        <dt><a id="opt-programs.zsh.enable">programs.zsh.enable</a></dt>
+        <dd><p>Enable zsh</p><span class="term">Type: boolean</span></dd>
+        </body></html>
+        """
+        mock_resp = Mock()
+        mock_resp.content = html
+        mock_resp.raise_for_status = Mock()
+        mock_get.return_value = mock_resp
+
+        result = parse_html_options(HOME_MANAGER_URL, query="GIT")
+        assert [opt["name"] for opt in result] == ["programs.git.enable"]
+
     @patch("mcp_nixos.utils.requests.get")
     def test_timeout(self, mock_get):
         from mcp_nixos.server import DocumentParseError
@@ -168,29 +188,106 @@ class TestChannelCache:
         assert cache.using_fallback is True
         assert "unstable" in result
 
-    @patch("mcp_nixos.sources.base.requests.post")
-    def test_discover_channels(self, mock_post):
-        mock_resp = Mock()
-        mock_resp.status_code = 200
-        mock_resp.json.return_value = {"count": 100000}
-        mock_post.return_value = mock_resp
+    def test_discover_channels(self, mocked_responses):
+        mocked_responses.add(
+            responses.POST,
+            re.compile(rf"{re.escape(NIXOS_API)}/latest-\d+-nixos-[\w.]+/_count"),
+            json={"count": 100000},
+        )
 
         cache = ChannelCache()
         cache.available_channels = None
         result = cache.get_available()
         assert isinstance(result, dict)
+        assert len(result) == len(mocked_responses.calls) == 20
+        assert list(result)[0] == "latest-43-nixos-unstable"
+        assert result["latest-44-nixos-25.11"] == "100,000 documents"
+
+    def test_discover_channels_skips_failed_indices(self, mocked_responses):
+        mocked_responses.add(
+            responses.POST, re.compile(rf"{re.escape(NIXOS_API)}/latest-44-nixos-unstable/_count"), json={"count": 5}
+        )
+        mocked_responses.add(
+            responses.POST,
+            re.compile(rf"{re.escape(NIXOS_API)}/latest-\d+-nixos-[\w.]+/_count"),
+            body=requests.ConnectionError(),
+        )
+
+        cache = ChannelCache()
+        assert cache._discover_available_channels() == {"latest-44-nixos-unstable": "5 documents"}
+
+    def test_disk_cache_roundtrip(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        cache = ChannelCache()
+        assert cache.resolved_channels is None
+        cache.available_channels = {"latest-44-nixos-unstable": "100 documents"}
+        cache.get_resolved()
+
+        assert (tmp_path / "mcp-nixos" / "channels.json").exists()
+        warm = ChannelCache()
+        assert warm.resolved_channels is None  # nothing is read until first use
+        assert warm.get_resolved() == {"unstable": "latest-44-nixos-unstable"}
+        assert warm.available_channels == {"latest-44-nixos-unstable": "100 documents"}
+
+    def test_disk_cache_read_after_env_change(self, monkeypatch, tmp_path):
+        # The global cache is built at import time; the cache path must be looked up on first use
+        cache = ChannelCache()
+        cache_file = tmp_path / "mcp-nixos" / "channels.json"
+        cache_file.parent.mkdir()
+        cache_file.write_text(json.dumps({"available": {"a": "1 documents"}, "resolved": {"unstable": "a"}}))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert cache.get_resolved() == {"unstable": "a"}
+
+    def test_disk_cache_expired(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        cache_file = tmp_path / "mcp-nixos" / "channels.json"
+        cache_file.parent.mkdir()
+        cache_file.write_text(json.dumps({"available": {"a": "1 documents"}, "resolved": {"unstable": "a"}}))
+        stale = time.time() - CHANNEL_CACHE_TTL - 60
+        os.utime(cache_file, (stale, stale))
+
+        cache = ChannelCache()
+        cache._load_from_disk()
+        assert cache.resolved_channels is None
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"available": {"a": "1 documents"}, "resolved": {"unstable": 42}},
+            {"available": {"a": "1 documents"}, "resolved": {"unstable": {"index": "a"}}},
+            {"available": ["a"], "resolved": {"unstable": "a"}},
+            {"available": {"a": None}, "resolved": {"unstable": "a"}},
+        ],
+        ids=["int-index", "nested-index", "available-list", "available-null"],
+    )
+    def test_disk_cache_rejects_malformed(self, monkeypatch, tmp_path, payload):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        cache_file = tmp_path / "mcp-nixos" / "channels.json"
+        cache_file.parent.mkdir()
+        cache_file.write_text(json.dumps(payload))
+
+        cache = ChannelCache()
+        cache._load_from_disk()
+        assert cache.resolved_channels is None
+        assert cache.available_channels is None
+
+    def test_fallback_not_persisted(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        cache = ChannelCache()
+        cache.available_channels = {}
+        cache.get_resolved()
+        assert not (tmp_path / "mcp-nixos" / "channels.json").exists()
 
 
 @pytest.mark.unit
 class TestChannelValidation:
     """Test channel validation helpers."""
 
-    @patch("mcp_nixos.sources.base.requests.post")
     @patch("mcp_nixos.sources.base.get_channels")
-    def test_valid_channel(self, mock_get_channels, mock_post):
+    def test_valid_channel(self, mock_get_channels, mocked_responses):
         mock_get_channels.return_value = {"stable": "latest-44-nixos-25.11"}
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {"count": 100}
+        mocked_responses.add(responses.POST, f"{NIXOS_API}/latest-44-nixos-25.11/_count", json={"count": 100})
         result = validate_channel("stable")
         assert result is True
 
@@ -200,9 +297,11 @@ class TestChannelValidation:
         result = validate_channel("nonexistent")
         assert result is False
 
-    def test_special_characters(self):
+    @patch("mcp_nixos.sources.base.get_channels")
+    def test_special_characters(self, mock_get_channels):
         result = validate_channel("invalid<>channel")
         assert result is False
+        mock_get_channels.assert_not_called()
 
     def test_suggestions(self):
         result = get_channel_suggestions("unstabel")